@@ -1,6 +1,10 @@
 import random
 import numpy as np
-from typing import List, Callable
+from typing import List, Callable, Optional
+
+from autotm.algorithms_for_tuning.genetic_algorithm.kernels import blend_crossover_kernel, uniform_crossover_kernel
+
+_RNG = np.random.default_rng()
 
 
 def crossover_pmx(parent_1: List[float], parent_2: List[float], **kwargs) -> List[List[float]]:
@@ -140,3 +144,79 @@ def crossover(crossover_type: str = "crossover_one_point") -> Callable:
         return crossover_one_point
     if crossover_type == "blend_crossover":
         return crossover_blend
+
+
+def crossover_one_point_batch(parents_1: np.ndarray, parents_2: np.ndarray, **kwargs) -> List[np.ndarray]:
+    """
+    One-point crossover for a batch of pairs
+
+    Vectorized version of crossover_one_point
+
+    Parameters
+    ----------
+    parents_1: np.ndarray
+        Matrix of the first individuals of the pairs, one individual per row
+    parents_2: np.ndarray
+        Matrix of the second individuals of the pairs, one individual per row
+    out: List[np.ndarray], optional
+        Matrices to write the first and the second children to
+
+    Returns
+    ----------
+    Matrices of the first and the second children of the pairs
+    """
+    elem_cross_prob = kwargs["elem_cross_prob"]
+    out = kwargs.get("out") or [np.empty_like(parents_1), np.empty_like(parents_2)]
+    child_1, child_2 = uniform_crossover_kernel(parents_1, parents_2, _RNG.random(parents_1.shape), elem_cross_prob,
+                                                out[0], out[1])
+    return [child_1, child_2]
+
+
+def crossover_blend_batch(parents_1: np.ndarray, parents_2: np.ndarray, **kwargs) -> List[np.ndarray]:
+    """
+    Blend crossover for a batch of pairs
+
+    Vectorized version of crossover_blend
+
+    Parameters
+    ----------
+    parents_1: np.ndarray
+        Matrix of the first individuals of the pairs, one individual per row
+    parents_2: np.ndarray
+        Matrix of the second individuals of the pairs, one individual per row
+    alpha: float
+        Blending coefficient
+    out: List[np.ndarray], optional
+        Matrix to write the children to as the first element
+
+    Returns
+    ----------
+    Matrix of the children of the pairs
+    """
+    alpha = kwargs["alpha"]
+    out = kwargs.get("out") or [np.empty_like(parents_1)]
+    pairs_num = len(parents_1)
+    gamma = (1 - 2 * alpha) * _RNG.random(pairs_num) - alpha
+    from_parent_1 = _RNG.random(pairs_num) > 0.5
+    child = blend_crossover_kernel(parents_1, parents_2, gamma, from_parent_1, out[0])
+    return [child]
+
+
+def batch_crossover(crossover_type: str = "crossover_one_point") -> Optional[Callable]:
+    """
+    Batch crossover function
+
+    Parameters
+    ----------
+    crossover_type : str, default="crossover_one_point"
+        Crossover to be used in the genetic algorithm
+
+    Returns
+    ----------
+    Vectorized version of the crossover or None if there is no such version
+    """
+    if crossover_type == "crossover_one_point":
+        return crossover_one_point_batch
+    if crossover_type == "blend_crossover":
+        return crossover_blend_batch
+    return None
@@ -1,32 +1,36 @@
-import copy
-import gc
 import logging
 import math
-import operator
 import random
 import sys
 import time
 import uuid
+from collections import OrderedDict
 from typing import Optional, Tuple, Callable
 
 import numpy as np
 
 from autotm.abstract_params import AbstractParams
+from autotm.algorithms_for_tuning.genetic_algorithm.crossover import batch_crossover
 from autotm.algorithms_for_tuning.genetic_algorithm.statistics_collector import StatisticsCollector
 from autotm.algorithms_for_tuning.genetic_algorithm.selection import selection
 from autotm.algorithms_for_tuning.genetic_algorithm.surrogate import set_surrogate_fitness, Surrogate, \
     get_prediction_uncertanty
-from autotm.algorithms_for_tuning.individuals import make_individual, IndividualDTO, Individual
+from autotm.algorithms_for_tuning.individuals import make_individual, IndividualDTO, Individual, params_matrix, \
+    fitness_vector
 from autotm.algorithms_for_tuning.nelder_mead_optimization.nelder_mead import (
     NelderMeadOptimization,
 )
-from autotm.fitness.tasks import estimate_fitness, log_best_solution
-from autotm.params import create_individual, FixedListParams
+from autotm.fitness.tasks import estimate_fitness_async, log_best_solution
+from autotm.params import create_population, FixedListParams
 from autotm.utils import AVG_COHERENCE_SCORE
 from autotm.visualization.dynamic_tracker import MetricsCollector
 
 ALG_ID = "ga"
 SPEEDUP = True
+# the fitness cache keeps results of this many last generations
+FITNESS_CACHE_GENERATIONS = 10
+
+_RNG = np.random.default_rng()
 
 logger = logging.getLogger("GA_algo")
 
@@ -126,8 +130,15 @@ class GA:
         self.early_stopping_iterations = early_stopping_iterations
         self.fitness_obj_type = fitness_obj_type
         self.best_proc = best_proc
+        # number of the best parents that are always transferred to the next generation
+        self.elite_count = int(np.ceil(num_individuals * best_proc))
         self.all_params = []
         self.all_fitness = []
+        # real (not surrogate) fitness values by params, least recently used first
+        self.fitness_cache = OrderedDict()
+        self.fitness_cache_size = FITNESS_CACHE_GENERATIONS * num_individuals
+        # scratch matrices of the batch crossover: parents_1, parents_2, children_1, children_2
+        self.crossover_buffers = None
         if surrogate_name:
             self.surrogate = Surrogate(surrogate_name, **kwargs)
         else:
@@ -151,37 +162,76 @@ class GA:
             {}
         )  # generation, parent_1_params, parent_2_params, ...
 
-    def estimate_fitness(self, population):
-        evaluated = [individual for individual in population if individual.dto.fitness_value is not None]
-        not_evaluated = [individual for individual in population if individual.dto.fitness_value is None]
+    def _make_dto(self, params: AbstractParams, iteration_id: int = 0, **kwargs) -> IndividualDTO:
+        return IndividualDTO(
+            id=str(uuid.uuid4()),
+            data_path=self.data_path,
+            dataset=self.dataset,
+            params=params,
+            exp_id=self.exp_id,
+            alg_id=ALG_ID,
+            iteration_id=iteration_id,
+            topic_count=self.topic_count,
+            tag=self.tag,
+            train_option=self.train_option,
+            **kwargs,
+        )
+
+    def estimate_fitness_async(self, population) -> Callable[[], list]:
+        """
+        Sends not yet evaluated individuals of the population to be evaluated without waiting for the results.
+
+        :return: a function that waits for the results and returns the population with fitness values
+        """
+        evaluated = []
+        not_evaluated = []
+        for individual in population:
+            if individual.dto.fitness_value is None:
+                # params that have already been evaluated are not sent to the workers again
+                individual.dto.fitness_value = self._get_cached_fitness(individual)
+            if individual.dto.fitness_value is not None:
+                evaluated.append(individual)
+            else:
+                not_evaluated.append(individual)
         evaluations_limit = max(0, self.num_fitness_evaluations - self.evaluations_counter) \
             if self.num_fitness_evaluations else len(not_evaluated)
         if len(not_evaluated) > evaluations_limit:
             not_evaluated = not_evaluated[:evaluations_limit]
         self.evaluations_counter += len(not_evaluated)
-        new_evaluated = estimate_fitness(not_evaluated)
-        if self.statistics_collector:
-            for individual in new_evaluated:
-                self.statistics_collector.log_individual(individual)
-        return evaluated + new_evaluated
+        fitness_result = estimate_fitness_async(not_evaluated)
+
+        def get_results():
+            new_evaluated = fitness_result.get()
+            self._cache_fitness(new_evaluated)
+            if self.statistics_collector:
+                for individual in new_evaluated:
+                    self.statistics_collector.log_individual(individual)
+            return evaluated + new_evaluated
+
+        return get_results
+
+    def estimate_fitness(self, population):
+        return self.estimate_fitness_async(population)()
+
+    def _get_cached_fitness(self, individual):
+        key = individual.params.model_dump_json()
+        fitness_value = self.fitness_cache.get(key)
+        if fitness_value is None:
+            return None
+        self.fitness_cache.move_to_end(key)
+        return dict(fitness_value)
+
+    def _cache_fitness(self, population):
+        for individual in population:
+            self.fitness_cache[individual.params.model_dump_json()] = individual.dto.fitness_value
+        while len(self.fitness_cache) > self.fitness_cache_size:
+            self.fitness_cache.popitem(last=False)
 
     def init_population(self):
         list_of_individuals = []
-        for i in range(self.num_individuals):
-            dto = IndividualDTO(
-                id=str(uuid.uuid4()),
-                data_path=self.data_path,
-                dataset=self.dataset,
-                params=create_individual(base_model=i == 0, use_pipeline=self.use_pipeline),
-                exp_id=self.exp_id,
-                alg_id=ALG_ID,
-                iteration_id=0,
-                topic_count=self.topic_count,
-                tag=self.tag,
-                train_option=self.train_option,
-            )
+        for params in create_population(self.num_individuals, use_pipeline=self.use_pipeline):
             # TODO: improve heuristic on search space
-            list_of_individuals.append(make_individual(dto=dto))
+            list_of_individuals.append(make_individual(dto=self._make_dto(params, iteration_id=0)))
         population_with_fitness = self.estimate_fitness(list_of_individuals)
 
         self.save_params(population_with_fitness)
@@ -192,12 +242,26 @@ class GA:
 
     @staticmethod
     def _sort_population(population):
-        population.sort(key=operator.attrgetter("fitness_value"), reverse=True)
+        # stable, so individuals with equal fitness keep their order as with list.sort
+        order = np.argsort(-fitness_vector(population), kind="stable")
+        population[:] = [population[i] for i in order]
+
+    @staticmethod
+    def _best_individuals(population, k):
+        """
+        Returns k individuals with the highest fitness in no particular order
+        """
+        if k >= len(population):
+            return list(population)
+        if k <= 0:
+            return []
+        best_ids = np.argpartition(-fitness_vector(population), k - 1)[:k]
+        return [population[i] for i in best_ids]
 
     def _calculate_uncertain_res(self, generation, iteration_num: int, proc=0.3):
         if len(generation) == 0:
             return []
-        X = np.array([individ.dto.params.to_vector() for individ in generation])
+        X = params_matrix(generation)
         certanty = get_prediction_uncertanty(
             self.surrogate.surrogate, X, self.surrogate.name
         )
@@ -209,39 +273,28 @@ class GA:
         )  # check
         calculated = []
         for individual in generation[:recalculate_num]:
-            # copy
-            individual_json = individual.dto.model_dump_json()
-            individual = make_individual(dto=IndividualDTO.model_validate_json(individual_json))
-            individual.dto.fitness_value = None
-            calculated.append(individual)
+            # a shallow copy is enough: only the fitness value differs, and params are not changed by the evaluation
+            calculated.append(make_individual(dto=individual.dto.model_copy(update={"fitness_value": None})))
 
-        calculated = self.estimate_fitness(calculated)
+        get_calculated = self.estimate_fitness_async(calculated)
 
+        # the rest is predicted by the surrogate while the uncertain individuals are being evaluated
+        pred_y = self.surrogate.predict(X[recalculate_num:])
+        predicted = [
+            make_individual(dto=self._make_dto(individual.dto.params, fitness_value=set_surrogate_fitness(pred_y[ix])))
+            for ix, individual in enumerate(generation[recalculate_num:])
+        ]
+
+        calculated = get_calculated()
         self.all_params += [individ.dto.params.to_vector() for individ in calculated]
         self.all_fitness += [
             individ.dto.fitness_value["avg_coherence_score"] for individ in calculated
         ]
-
-        pred_y = self.surrogate.predict(X[recalculate_num:])
-        for ix, individual in enumerate(generation[recalculate_num:]):
-            dto = IndividualDTO(
-                id=str(uuid.uuid4()),
-                data_path=self.data_path,
-                params=individual.dto.params,
-                dataset=self.dataset,
-                fitness_value=set_surrogate_fitness(pred_y[ix]),
-                exp_id=self.exp_id,
-                alg_id=ALG_ID,
-                topic_count=self.topic_count,
-                tag=self.tag,
-                train_option=self.train_option,
-            )
-            calculated.append(make_individual(dto=dto))
-        return calculated
+        return calculated + predicted
 
     def save_params(self, population):
         params_and_f = [
-            (copy.deepcopy(individ.params.to_vector()), individ.fitness_value)
+            (list(individ.params.to_vector()), individ.fitness_value)
             for individ in population
             if individ.fitness_value not in self.all_fitness
         ]
@@ -266,7 +319,7 @@ class GA:
         self.all_fitness += fs
 
     def surrogate_calculation(self, population):
-        X_val = np.array([copy.deepcopy(individ.params.to_vector()) for individ in population])
+        X_val = params_matrix(population)
         y_pred = self.surrogate.predict(X_val)
         if not SPEEDUP:
             y_val = np.array([individ.fitness_value for individ in population])
@@ -296,7 +349,7 @@ class GA:
             individ.dto.fitness_value = set_surrogate_fitness(y_pred[ix])
         return population
 
-    def run_crossover(self, pairs_generator, surrogate_iteration, iteration_num: int):
+    def run_crossover(self, population, parents_1, parents_2, surrogate_iteration, iteration_num: int):
         new_generation = []
 
         crossover_changes = {
@@ -307,31 +360,9 @@ class GA:
             "child_id": [],
         }
 
-        for i, j in pairs_generator:
-            if i is None:
-                break
-
-            children = run_with_retry(
-                action=lambda: i.params.crossover(j.params, crossover_type=self.crossover_type,
-                                                  elem_cross_prob=self.elem_cross_prob, alpha=self.alpha),
-                condition=lambda candidates: all(child.validate_params() for child in candidates),
-                default_value=[]
-            )
-
-            children_dto = [IndividualDTO(
-                id=str(uuid.uuid4()),
-                data_path=self.data_path,
-                dataset=self.dataset,
-                params=child,
-                exp_id=self.exp_id,
-                alg_id=ALG_ID,
-                iteration_id=iteration_num,
-                topic_count=self.topic_count,
-                tag=self.tag,
-                train_option=self.train_option,
-            ) for child in children]
-
-            individuals = [make_individual(child) for child in children_dto]
+        pairs = [(population[i], population[j]) for i, j in zip(parents_1.tolist(), parents_2.tolist())]
+        for (i, j), children in zip(pairs, self._crossover_pairs(population, parents_1, parents_2)):
+            individuals = [make_individual(self._make_dto(child, iteration_id=iteration_num)) for child in children]
             new_generation += individuals
 
             crossover_changes["parent_1_params"].append(i.params)
@@ -360,6 +391,56 @@ class GA:
 
         return new_generation
 
+    def _crossover_pairs(self, population, parents_1, parents_2):
+        batch_crossover_fun = batch_crossover(self.crossover_type)
+        if batch_crossover_fun is None or self.use_pipeline or len(parents_1) == 0:
+            pairs = [(population[i], population[j]) for i, j in zip(parents_1.tolist(), parents_2.tolist())]
+            return [
+                run_with_retry(
+                    action=lambda: i.params.crossover(j.params, crossover_type=self.crossover_type,
+                                                      elem_cross_prob=self.elem_cross_prob, alpha=self.alpha),
+                    condition=lambda candidates: all(child.validate_params() for child in candidates),
+                    default_value=[]
+                )
+                for i, j in pairs
+            ]
+
+        # fixed list params of all the pairs are crossed over at once
+        population_params = params_matrix(population)
+        parents_1_params, parents_2_params, *children_buffers = self._get_crossover_buffers(
+            len(parents_1), population_params.shape[1]
+        )
+        np.take(population_params, parents_1, axis=0, out=parents_1_params)
+        np.take(population_params, parents_2, axis=0, out=parents_2_params)
+        children_matrices = batch_crossover_fun(
+            parents_1_params,
+            parents_2_params,
+            elem_cross_prob=self.elem_cross_prob,
+            alpha=self.alpha,
+            out=children_buffers,
+        )
+        pairs_children = []
+        for k in range(len(parents_1)):
+            children = [FixedListParams(params=matrix[k].tolist()) for matrix in children_matrices]
+            # validation of fixed list params only clips values, so it never rejects a child
+            for child in children:
+                child.validate_params()
+            pairs_children.append(children)
+        return pairs_children
+
+    def _get_crossover_buffers(self, pairs_num, params_num):
+        """
+        Returns views of the crossover scratch matrices with pairs_num rows.
+        The matrices are allocated once and only grow when selection gives more pairs than they fit.
+        Children are converted to lists right after the crossover, so the buffers can be reused.
+        """
+        buffers = self.crossover_buffers
+        if buffers is None or len(buffers[0]) < pairs_num or buffers[0].shape[1] != params_num:
+            rows = max(pairs_num, self.num_individuals)
+            buffers = [np.empty((rows, params_num), dtype=np.float64) for _ in range(4)]
+            self.crossover_buffers = buffers
+        return [buffer[:pairs_num] for buffer in buffers]
+
     def apply_nelder_mead(self, starting_points_set, num_gen, num_iterations=2):
         nelder_opt = NelderMeadOptimization(
             data_path=self.data_path,
@@ -377,19 +458,7 @@ class GA:
             solution = list(res["x"])
             solution = (solution[:-1] + point[12:15] + [solution[-1]])  # TODO: check mutation ids
             fitness = -res.fun
-            solution_dto = IndividualDTO(
-                id=str(uuid.uuid4()),
-                data_path=self.data_path,
-                dataset=self.dataset,
-                params=solution,
-                exp_id=self.exp_id,
-                alg_id=ALG_ID,
-                iteration_id=num_gen,
-                topic_count=self.topic_count,
-                tag=self.tag,
-                fitness_value={AVG_COHERENCE_SCORE: fitness},
-                train_option=self.train_option,
-            )
+            solution_dto = self._make_dto(solution, iteration_id=num_gen, fitness_value={AVG_COHERENCE_SCORE: fitness})
 
             new_population.append(make_individual(dto=solution_dto))
         return new_population
@@ -432,7 +501,7 @@ class GA:
             self._sort_population(population)
             if self.statistics_collector is not None:
                 self.statistics_collector.log_iteration(self.evaluations_counter, population[0].fitness_value)
-            pairs_generator = self.selection(
+            parents_1, parents_2 = self.selection(
                 population=population,
                 best_proc=self.best_proc,
                 children_num=self.crossover_children,
@@ -442,39 +511,24 @@ class GA:
 
             # Crossover
             new_generation = self.run_crossover(
-                pairs_generator, surrogate_iteration, iteration_num=ii
+                population, parents_1, parents_2, surrogate_iteration, iteration_num=ii
             )
 
-            self._sort_population(new_generation)
-            self._sort_population(population)
-
             logger.info("CROSSOVER IS OVER")
 
             if self.use_nelder_mead_in_crossover:
                 # TODO: implement Nelder-Mead here
                 pass
 
-            del pairs_generator
-            gc.collect()
-
-            # population_params = [copy.deepcopy(individ.params) for individ in population]
-
-            the_best_guy_params = copy.deepcopy(population[0].params)
+            # the best individual is not modified until the mutation step, so no copy is needed
+            the_best_guy_params = population[0].params
             new_generation = [individ for individ in new_generation if individ.params != the_best_guy_params]
 
-            new_generation_n = min(
-                self.num_individuals - int(np.ceil(self.num_individuals * self.best_proc)),
-                len(new_generation),
-            )
+            new_generation_n = min(self.num_individuals - self.elite_count, len(new_generation))
             old_generation_n = self.num_individuals - new_generation_n
 
-            population = population[:old_generation_n] + new_generation[:new_generation_n]
-
-            try:
-                del new_generation
-            except Exception as e:
-                logger.warning(e)
-            gc.collect()
+            # population is still sorted: selection doesn't reorder it
+            population = population[:old_generation_n] + self._best_individuals(new_generation, new_generation_n)
 
             self._sort_population(population)
 
@@ -506,13 +560,7 @@ class GA:
             self._sort_population(population)
 
             if self.use_nelder_mead_in_mutation:
-                collected_params = []
-                for elem in population:
-                    collected_params.append(elem.params)
-                random_ids = random.sample(
-                    [i for i in range(len(collected_params))], k=3
-                )
-                starting_points = [collected_params[i] for i in random_ids]
+                starting_points = random.sample([elem.params for elem in population], k=3)
 
                 nm_population = self.apply_nelder_mead(starting_points, num_gen=ii)
                 for i, elem in enumerate(nm_population):
@@ -523,21 +571,7 @@ class GA:
                         population[i] = elem
 
             if self.num_fitness_evaluations and self.evaluations_counter >= self.num_fitness_evaluations:
-                self.metric_collector.save_fitness(
-                    generation=ii,
-                    params=[i.params for i in population],
-                    fitness=[i.fitness_value for i in population],
-                )
-                bparams = "".join([str(i) for i in population[0].params])
-                logger.info(
-                    f"TERMINATION IS TRIGGERED: EVAL NUM (2)."
-                    f"DATASET {self.dataset}."
-                    f"TOPICS NUM {self.topic_count}."
-                    f"RUN ID {run_id}."
-                    f"THE BEST FITNESS {population[0].fitness_value}."
-                    f"THE BEST PARAMS {bparams}."
-                    f"ITERATION TIME {time.time() - iteration_start_time}."
-                )
+                self._log_termination("EVAL NUM (2)", population, ii, run_id, iteration_start_time)
                 break
 
             current_fitness = population[0].fitness_value
@@ -561,21 +595,7 @@ class GA:
                 else:
                     early_stopping_counter += 1
                     if early_stopping_counter == self.early_stopping_iterations:
-                        bparams = "".join([str(i) for i in population[0].params])
-                        self.metric_collector.save_fitness(
-                            generation=ii,
-                            params=[i.params for i in population],
-                            fitness=[i.fitness_value for i in population],
-                        )
-                        logger.info(
-                            f"TERMINATION IS TRIGGERED: EARLY STOPPING."
-                            f"DATASET {self.dataset}."
-                            f"TOPICS NUM {self.topic_count}."
-                            f"RUN ID {run_id}."
-                            f"THE BEST FITNESS {population[0].fitness_value}."
-                            f"THE BEST PARAMS {bparams}."
-                            f"ITERATION TIME {time.time() - iteration_start_time}."
-                        )
+                        self._log_termination("EARLY STOPPING", population, ii, run_id, iteration_start_time)
                         break
 
             x.append(ii)
@@ -610,6 +630,22 @@ class GA:
 
         return ind
 
+    def _log_termination(self, reason, population, ii, run_id, iteration_start_time):
+        self.metric_collector.save_fitness(
+            generation=ii,
+            params=[i.params for i in population],
+            fitness=[i.fitness_value for i in population],
+        )
+        logger.info(
+            f"TERMINATION IS TRIGGERED: {reason}."
+            f"DATASET {self.dataset}."
+            f"TOPICS NUM {self.topic_count}."
+            f"RUN ID {run_id}."
+            f"THE BEST FITNESS {population[0].fitness_value}."
+            f"THE BEST PARAMS {population[0].params}."
+            f"ITERATION TIME {time.time() - iteration_start_time}."
+        )
+
     def run_fitness(self, population, surrogate_iteration, ii):
         fitness_calc_time_start = time.time()
         if not SPEEDUP or not self.surrogate or not surrogate_iteration:
@@ -627,27 +663,29 @@ class GA:
         return population
 
     def run_mutation(self, population):
-        for i in range(1, len(population)):
-            if random.random() <= population[i].params.mutation_probability:
-                params = run_with_retry(
-                    action=lambda: population[i].params.mutate(mutation_type=self.mutation_type),
-                    condition=lambda candidate: candidate.validate_params()
-                )
-                if params is None:
-                    continue
-
-                dto = IndividualDTO(
-                    id=str(uuid.uuid4()),
-                    data_path=self.data_path,
-                    dataset=self.dataset,
-                    params=params,
-                    exp_id=self.exp_id,
-                    alg_id=ALG_ID,
-                    topic_count=self.topic_count,
-                    tag=self.tag,
-                    train_option=self.train_option,
-                )
-                population[i] = make_individual(dto=dto)
+        # the best individual (index 0) is never mutated,
+        # the mutation decisions for the rest are drawn at once
+        mutation_probabilities = np.fromiter(
+            (individual.params.mutation_probability for individual in population[1:]),
+            dtype=np.float64,
+            count=max(len(population) - 1, 0),
+        )
+        to_mutate = np.flatnonzero(_RNG.random(len(mutation_probabilities)) <= mutation_probabilities) + 1
+        for i in to_mutate.tolist():
+            params = run_with_retry(
+                action=lambda: population[i].params.mutate(mutation_type=self.mutation_type),
+                condition=lambda candidate: candidate.validate_params()
+            )
+            if params is None:
+                continue
+
+            # the individual is updated in place: mutate() returns new params,
+            # so the old params object, possibly referenced elsewhere, stays intact.
+            # A mutated individual is a new candidate and gets its own id.
+            dto = population[i].dto
+            dto.id = str(uuid.uuid4())
+            dto.params = params
+            dto.fitness_value = None
 
 
 # multistage bag of regularizers approach
@@ -0,0 +1,71 @@
+"""
+Numeric kernels of the batch crossovers.
+
+The kernels are compiled with numba when it is installed and fall back to plain NumPy otherwise.
+All the random values are drawn by the caller, so both versions produce the same results.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# positions of the self-adaptive meta params that are inherited as is by blend crossover
+META_PARAMS_START = 12
+META_PARAMS_END = 15
+
+
+def _blend_crossover_numpy(parents_1: np.ndarray, parents_2: np.ndarray, gamma: np.ndarray,
+                           from_parent_1: np.ndarray, out: np.ndarray) -> np.ndarray:
+    gamma = gamma[:, np.newaxis]
+    np.multiply(1 - gamma, parents_1, out=out)
+    out += gamma * parents_2
+    out[:, META_PARAMS_START:META_PARAMS_END] = np.where(
+        from_parent_1[:, np.newaxis],
+        parents_1[:, META_PARAMS_START:META_PARAMS_END],
+        parents_2[:, META_PARAMS_START:META_PARAMS_END],
+    )
+    return out
+
+
+def _uniform_crossover_numpy(parents_1: np.ndarray, parents_2: np.ndarray, rand_mat: np.ndarray,
+                             elem_cross_prob: float, out_1: np.ndarray, out_2: np.ndarray):
+    swap = rand_mat < elem_cross_prob
+    np.copyto(out_1, parents_1)
+    np.copyto(out_2, parents_2)
+    out_1[swap] = parents_2[swap]
+    out_2[swap] = parents_1[swap]
+    return out_1, out_2
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _blend_crossover_numba(parents_1, parents_2, gamma, from_parent_1, out):
+        for k in prange(parents_1.shape[0]):
+            g = gamma[k]
+            for j in range(parents_1.shape[1]):
+                out[k, j] = (1 - g) * parents_1[k, j] + g * parents_2[k, j]
+            for j in range(META_PARAMS_START, META_PARAMS_END):
+                out[k, j] = parents_1[k, j] if from_parent_1[k] else parents_2[k, j]
+        return out
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _uniform_crossover_numba(parents_1, parents_2, rand_mat, elem_cross_prob, out_1, out_2):
+        for k in prange(parents_1.shape[0]):
+            for j in range(parents_1.shape[1]):
+                if rand_mat[k, j] < elem_cross_prob:
+                    out_1[k, j] = parents_2[k, j]
+                    out_2[k, j] = parents_1[k, j]
+                else:
+                    out_1[k, j] = parents_1[k, j]
+                    out_2[k, j] = parents_2[k, j]
+        return out_1, out_2
+
+    blend_crossover_kernel = _blend_crossover_numba
+    uniform_crossover_kernel = _uniform_crossover_numba
+else:
+    blend_crossover_kernel = _blend_crossover_numpy
+    uniform_crossover_kernel = _uniform_crossover_numpy
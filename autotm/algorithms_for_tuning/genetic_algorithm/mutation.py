@@ -140,6 +140,12 @@ def mutation_psm(individ, elem_mutation_prob=0.1, **kwargs):
 
 
 def mutation(mutation_type="mutation_one_param"):
+    """
+    Mutation function
+
+    The returned function changes the given list of params in place and returns it,
+    so the caller should pass a copy if the original params are still needed
+    """
     if mutation_type == "mutation_one_param":
         return mutation_one_param
     if mutation_type == "combined":
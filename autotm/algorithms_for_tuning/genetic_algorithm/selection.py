@@ -1,84 +1,99 @@
-import operator
+from typing import Tuple
+
 import numpy as np
-import random
+
+from autotm.algorithms_for_tuning.individuals import fitness_vector
+
+_RNG = np.random.default_rng()
 
 
 # TODO: roulette wheel selection, stochastic universal sampling and tournament selection
 
 
-def yield_matching_pairs(pairs, population):
-    # print('Number of pairs: {}'.format(pairs))
-    population.sort(key=operator.attrgetter("fitness_value"))
-    population_pairs_pool = []
+def select_matching_pairs(pairs: int, probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Chooses pairs of parents
 
+    Each round the first parent is the first individual whose selection probability
+    is not less than a uniform draw, the second one is chosen the same way among the rest
+    so that the pair hasn't been chosen before. If there is no such second parent,
+    a random one is taken. Rounds go on until `pairs` distinct pairs are chosen
+    or no individual is selected at all.
+
+    Parameters
+    ----------
+    pairs: int
+        Number of distinct pairs to choose
+    probabilities: np.ndarray
+        Selection probabilities of individuals ordered by ascending fitness
+
+    Returns
+    ----------
+    Indices of the first and the second parents in the order of probabilities
+    """
+    population_size = len(probabilities)
+    parents_1, parents_2 = [], []
+    population_pairs_pool = set()
     while len(population_pairs_pool) < pairs:
-        chosen = []
-        idx = 0
-        selection_probability = random.random()
-        for ix, individ in enumerate(population):
-            if selection_probability <= individ._prob:
-                idx = ix
-                chosen.append(individ)
+        rounds_num = pairs - len(population_pairs_pool)
+        # hits[r, 0] and hits[r, 1] mark the candidates for the first and the second parent of round r
+        hits = probabilities[np.newaxis, np.newaxis, :] >= _RNG.random((rounds_num, 2, 1))
+        for first_hits, second_hits in hits:
+            chosen = []
+            idx = 0
+            if first_hits.any():
+                idx = int(np.argmax(first_hits))
+                chosen.append(idx)
+
+            for k in np.flatnonzero(second_hits).tolist():
+                elems = frozenset((idx, k))
+                if k != idx and elems not in population_pairs_pool:
+                    chosen.append(k)
+                    population_pairs_pool.add(elems)
+                    break
+
+            if len(chosen) == 0:
+                return np.array(parents_1, dtype=np.int64), np.array(parents_2, dtype=np.int64)
+            if len(chosen) == 1:
+                selection_idx = int(_RNG.integers(population_size - 1))
+                chosen.append(selection_idx + (selection_idx >= idx))
+
+            parents_1.append(chosen[0])
+            parents_2.append(chosen[1])
+            if len(population_pairs_pool) >= pairs:
                 break
+    return np.array(parents_1, dtype=np.int64), np.array(parents_2, dtype=np.int64)
 
-        selection_probability = random.random()
-        for k, individ in enumerate(population):
-            if k != idx:
-                if selection_probability <= individ._prob:
-                    elems = frozenset((idx, k))
-                    if (len(population_pairs_pool) == 0) or (
-                        (len(population_pairs_pool) > 0)
-                        and (elems not in population_pairs_pool)
-                    ):
-                        chosen.append(individ)
-                        population_pairs_pool.append(elems)
-                        break
-            else:
-                continue
-        if len(chosen) == 1:
-            selection_idx = np.random.choice(
-                [m for m in [i for i in range(len(population))] if m != idx]
-            )
-            chosen.append(population[selection_idx])
-        if len(chosen) == 0:
-            yield None, None
-        else:
-            yield chosen[0], chosen[1]
 
+def _select_in_population_order(pairs: int, fitness: np.ndarray,
+                                 probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # parents are chosen by ascending fitness, stable to keep the order of individuals with equal fitness
+    order = np.argsort(fitness, kind="stable")
+    parents_1, parents_2 = select_matching_pairs(pairs, probabilities[order])
+    return order[parents_1], order[parents_2]
 
-def selection_fitness_prop(population, best_proc, children_num):
-    all_fitness = []
 
-    for individ in population:
-        all_fitness.append(individ.fitness_value)
-    fitness_std = np.std(all_fitness)
-    fitness_mean = np.mean(all_fitness)
-    cumsum_fitness = 0
+def selection_fitness_prop(population, best_proc, children_num):
+    fitness = fitness_vector(population)
     # adjust probabilities with sigma scaling
     c = 2
-    for individ in population:
-        updated_individ_fitness = max(individ.fitness_value - (fitness_mean - c * fitness_std), 0)
-        cumsum_fitness += updated_individ_fitness
-        individ._prob = updated_individ_fitness / cumsum_fitness
+    updated_fitness = np.maximum(fitness - (np.mean(fitness) - c * np.std(fitness)), 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probabilities = updated_fitness / np.cumsum(updated_fitness)
     pairs_count = len(population) * (1 - best_proc)
     if children_num == 2:
         pairs_count //= 2
-    return yield_matching_pairs(round(pairs_count), population)
+    return _select_in_population_order(round(pairs_count), fitness, probabilities)
 
 
 def selection_rank_based(population, best_proc, children_num):
-    population.sort(key=operator.attrgetter("fitness_value"))
-    for ix, individ in enumerate(population):
-        individ._prob = 2 * (ix + 1) / (len(population) * (len(population) - 1))
-    if children_num == 2:
-        # new population size
-        return yield_matching_pairs(
-            round((len(population) * (1 - best_proc))), population
-        )
-    else:
-        return yield_matching_pairs(
-            round((len(population) * (1 - best_proc))), population
-        )
+    fitness = fitness_vector(population)
+    population_size = len(population)
+    # probabilities by rank, the worst individual has rank 1
+    ranks = np.empty(population_size, dtype=np.float64)
+    ranks[np.argsort(fitness, kind="stable")] = np.arange(1, population_size + 1)
+    probabilities = 2 * ranks / (population_size * (population_size - 1))
+    return _select_in_population_order(round(population_size * (1 - best_proc)), fitness, probabilities)
 
 
 def stochastic_universal_sampling():
@@ -86,6 +101,12 @@ def stochastic_universal_sampling():
 
 
 def selection(selection_type="fitness_prop"):
+    """
+    Selection function
+
+    The returned function takes a population and gives indices of the first and the second parents
+    of the pairs in the population
+    """
     if selection_type == "fitness_prop":
         return selection_fitness_prop
     if selection_type == "rank_based":
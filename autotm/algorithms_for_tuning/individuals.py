@@ -1,6 +1,7 @@
 import os
 import pickle
 from abc import ABC, abstractmethod
+from typing import List
 
 import numpy as np
 import pandas as pd
@@ -146,3 +147,18 @@ def make_individual(dto: IndividualDTO) -> Individual:
     # TODO: choose fitness by ENV var
     return RegularFitnessIndividual(dto=dto)
     # return SparsityScalerBasedFitnessIndividual(dto=dto)
+
+
+def params_matrix(population: List[Individual]) -> np.ndarray:
+    """
+    Stacks params vectors of the population into a matrix, one individual per row
+    """
+    return np.array([individual.params.to_vector() for individual in population], dtype=np.float64)
+
+
+def fitness_vector(population: List[Individual]) -> np.ndarray:
+    """
+    Collects fitness values of the population into a vector
+    """
+    return np.fromiter((individual.fitness_value for individual in population),
+                       dtype=np.float64, count=len(population))
@@ -109,10 +109,66 @@ def calculate_fitness(self: Task,
         self.retry(max_retries=1, countdown=5)
 
 
-def parallel_fitness(population: List[Individual],
-                     use_tqdm: bool = False,
-                     tqdm_check_period: int = 2,
-                     app: Optional[celery.Celery] = None) -> List[Individual]:
+class FitnessResult:
+    """
+    Fitness values of a population that has been sent to the workers.
+    The results are awaited only when get() is called.
+    """
+
+    def __init__(self, population: List[Individual], group_result: GroupResult,
+                 use_tqdm: bool = False, tqdm_check_period: int = 2):
+        self.population = population
+        self.group_result = group_result
+        self.use_tqdm = use_tqdm
+        self.tqdm_check_period = tqdm_check_period
+
+    def get(self) -> List[Individual]:
+        g = self.group_result
+        tqdm_out = TqdmToLogger(logger, level=logging.INFO)
+
+        if self.use_tqdm:
+            # TODO: add timeout here
+            with tqdm(total=len(self.population), file=tqdm_out) as pbar:
+                while True:
+                    cc = g.completed_count()
+                    # logger.debug(f"Completed task count : {cc}")
+                    pbar.update(cc - pbar.n)
+
+                    # logger.debug(f"is ready {g.ready()} or failed {g.failed()}")
+
+                    if g.ready() or g.failed():
+                        break
+
+                    # TODO: make it into parameter
+                    time.sleep(self.tqdm_check_period)
+
+        # TODO: ugly workround to solve indefinite hanging g.get(), see pages below for additional info
+        # https://stackoverflow.com/questions/63860955/celery-async-result-get-hangs-waiting-for-result-even-after-celery-worker-has
+        # https://stackoverflow.com/questions/49006182/celery-redis-get-hangs-indefinitely-after-running-smoothly-for-70-hours
+        logger.info("Getting results")
+        # TODO: this is commented because of https://github.com/celery/celery/pull/7040
+        # waiting_delay = int(os.environ.get('AUTOTM_KUBE_FITNESS_WAITING_DELAY', '90'))
+        # while not g.ready():
+        #     logger.info(f"Results are not ready. Waiting for the next {waiting_delay} seconds...")
+        #     time.sleep(waiting_delay)
+        # logger.info("Results are ready, trying ot obtain them...")
+        # results = g.get()
+        results = g.get()
+        logger.info("The results have been obtained")
+
+        # restoring the order in the resulting population according to the initial population
+        # results_by_id = {ind.id: ind for ind in (fitness_from_json(r) for r in results)}
+        results_by_id = {ind.id: ind for ind in (IndividualDTO.parse_raw(r) for r in results)}
+        return [make_individual(results_by_id[ind.dto.id]) for ind in self.population]
+
+
+def parallel_fitness_async(population: List[Individual],
+                           use_tqdm: bool = False,
+                           tqdm_check_period: int = 2,
+                           app: Optional[celery.Celery] = None) -> FitnessResult:
+    """
+    Sends the population to be evaluated by the workers without waiting for the results
+    """
     ids = [ind.dto.id for ind in population]
     assert len(set(ids)) == len(population), \
         f"There are individuals with duplicate ids: {ids}"
@@ -135,42 +191,14 @@ def parallel_fitness(population: List[Individual],
 
     logger.info(f"Corresponding celery tasks ids: {[child.id for child in g.children]}")
 
-    tqdm_out = TqdmToLogger(logger, level=logging.INFO)
-
-    if use_tqdm:
-        # TODO: add timeout here
-        with tqdm(total=len(fitness_tasks), file=tqdm_out) as pbar:
-            while True:
-                cc = g.completed_count()
-                # logger.debug(f"Completed task count : {cc}")
-                pbar.update(cc - pbar.n)
-
-                # logger.debug(f"is ready {g.ready()} or failed {g.failed()}")
-
-                if g.ready() or g.failed():
-                    break
-
-                # TODO: make it into parameter
-                time.sleep(tqdm_check_period)
-
-    # TODO: ugly workround to solve indefinite hanging g.get(), see pages below for additional info
-    # https://stackoverflow.com/questions/63860955/celery-async-result-get-hangs-waiting-for-result-even-after-celery-worker-has
-    # https://stackoverflow.com/questions/49006182/celery-redis-get-hangs-indefinitely-after-running-smoothly-for-70-hours
-    logger.info("Getting results")
-    # TODO: this is commented because of https://github.com/celery/celery/pull/7040
-    # waiting_delay = int(os.environ.get('AUTOTM_KUBE_FITNESS_WAITING_DELAY', '90'))
-    # while not g.ready():
-    #     logger.info(f"Results are not ready. Waiting for the next {waiting_delay} seconds...")
-    #     time.sleep(waiting_delay)
-    # logger.info("Results are ready, trying ot obtain them...")
-    # results = g.get()
-    results = g.get()
-    logger.info("The results have been obtained")
-
-    # restoring the order in the resulting population according to the initial population
-    # results_by_id = {ind.id: ind for ind in (fitness_from_json(r) for r in results)}
-    results_by_id = {ind.id: ind for ind in (IndividualDTO.parse_raw(r) for r in results)}
-    return [make_individual(results_by_id[ind.dto.id]) for ind in population]
+    return FitnessResult(population, g, use_tqdm=use_tqdm, tqdm_check_period=tqdm_check_period)
+
+
+def parallel_fitness(population: List[Individual],
+                     use_tqdm: bool = False,
+                     tqdm_check_period: int = 2,
+                     app: Optional[celery.Celery] = None) -> List[Individual]:
+    return parallel_fitness_async(population, use_tqdm=use_tqdm, tqdm_check_period=tqdm_check_period, app=app).get()
 
 
 def log_best_solution(individual: Individual,
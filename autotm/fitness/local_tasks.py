@@ -70,6 +70,23 @@ def estimate_fitness(population: List[Individual]) -> List[Individual]:
     return population_with_fitness
 
 
+class DeferredFitness:
+    """
+    Local counterpart of cluster_tasks.FitnessResult.
+    There are no workers in the local mode, so the population is evaluated when get() is called.
+    """
+
+    def __init__(self, population: List[Individual]):
+        self.population = population
+
+    def get(self) -> List[Individual]:
+        return estimate_fitness(self.population)
+
+
+def estimate_fitness_async(population: List[Individual]) -> DeferredFitness:
+    return DeferredFitness(population)
+
+
 def log_best_solution(
         individual: IndividualDTO,
         wait_for_result_timeout: Optional[float] = None,
@@ -4,7 +4,6 @@ import logging
 import os
 import shutil
 import sys
-from glob import glob
 
 logging.basicConfig(
     level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -12,10 +11,14 @@ logging.basicConfig(
 logger = logging.getLogger()
 
 
+DATA_FILE_PREFIX = "irace-log-"
+DATA_FILE_SUFFIX = ".Rdata"
+
+
 # example: irace-log-2021-07-19T21:48:00-2b5faba3-99a8-47ba-a5cd-2c99e6877160.Rdata
 def fpath_to_datetime(fpath: str) -> datetime:
     fname = os.path.basename(fpath)
-    dt_str = fname[len("irace-log-"): len("irace-log-") + len("YYYY-mm-ddTHH:MM:ss")]
+    dt_str = fname[len(DATA_FILE_PREFIX): len(DATA_FILE_PREFIX) + len("YYYY-mm-ddTHH:MM:ss")]
     dt = datetime.datetime.strptime(dt_str, "%Y-%m-%dT%H:%M:%S")
     return dt
 
@@ -23,9 +26,13 @@ def fpath_to_datetime(fpath: str) -> datetime:
 if __name__ == "__main__":
     save_dir = sys.argv[1]
     logger.info(f"Looking for data files in {save_dir}")
-    data_files = [
-        (fpath, fpath_to_datetime(fpath)) for fpath in glob(f"{save_dir}/*.Rdata")
-    ]
+    # a single directory pass; only irace data files are considered, so every name can be parsed
+    with os.scandir(save_dir) as entries:
+        data_files = [
+            (entry.path, fpath_to_datetime(entry.name))
+            for entry in entries
+            if entry.name.startswith(DATA_FILE_PREFIX) and entry.name.endswith(DATA_FILE_SUFFIX) and entry.is_file()
+        ]
 
     if len(data_files) == 0:
         logger.info(
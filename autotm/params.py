@@ -4,6 +4,7 @@ import random
 from typing import List
 
 import artm
+import numpy as np
 from pydantic import BaseModel
 
 from autotm.abstract_params import AbstractParams
@@ -75,7 +76,7 @@ class FixedListParams(BaseModel, AbstractParams):
     def make_params_dict(self):
         if len(self.params) > len(PARAM_NAMES):
             len_diff = len(self.params) - len(PARAM_NAMES)
-            param_names = copy.deepcopy(PARAM_NAMES) + [
+            param_names = PARAM_NAMES + [
                 f"unknown_param_#{i}" for i in range(len_diff)
             ]
         else:
@@ -90,20 +91,24 @@ class FixedListParams(BaseModel, AbstractParams):
         assert isinstance(parent2, FixedListParams)
         from autotm.algorithms_for_tuning.genetic_algorithm.crossover import crossover
         crossover_fun = crossover(kwargs["crossover_type"])
-        children = crossover_fun(copy.deepcopy(self.params), copy.deepcopy(parent2.params), **kwargs)
+        # params is a flat list of numbers, so a shallow copy is enough
+        children = crossover_fun(list(self.params), list(parent2.params), **kwargs)
         return [FixedListParams(params=values) for values in children]
 
     def mutate(self, **kwargs) -> "AbstractParams":
         from autotm.algorithms_for_tuning.genetic_algorithm.mutation import mutation
         mutation_fun = mutation(kwargs["mutation_type"])
-        params = copy.deepcopy(self.params)
+        # mutations change the list in place, and params is a flat list of numbers, so a shallow copy is enough
+        params = list(self.params)
         elem_mutation_prob = params[13]
         params = mutation_fun(params, elem_mutation_prob=elem_mutation_prob)
 
         # TODO: check this code
-        for ix in [12, 13, 14]:
-            if random.random() < elem_mutation_prob:
-                params[ix] = META_PROBABILITY_DISTRIBUTION.create_value()
+        # self-adaptive meta params (12, 13, 14) are resampled with a single mask
+        resample = _RNG.random(3) < elem_mutation_prob
+        if resample.any():
+            fresh = _RNG.uniform(META_PROBABILITY_DISTRIBUTION.low, META_PROBABILITY_DISTRIBUTION.high, size=3)
+            params[12:15] = np.where(resample, fresh, params[12:15]).tolist()
         return FixedListParams(params=params)
 
     def to_vector(self) -> List[float]:
@@ -164,6 +169,41 @@ FIXED_LIST_STAGE_TYPE = StageType(name="FixedListStage", params=[
     Param(name="val_decor_2", distribution=DECORRELATION_PARAM_DISTRIBUTION),  # 15
 ])
 
+# params that are disabled in the base model
+BASE_MODEL_ZERO_PARAMS = [0, 4, 7, 10, 11, 15]
+
+_RNG = np.random.default_rng()
+_FIXED_LIST_INT_IDS = [i for i, param in enumerate(FIXED_LIST_STAGE_TYPE.params)
+                       if isinstance(param.distribution, IntRangeDistribution)]
+_FIXED_LIST_FLOAT_IDS = [i for i, param in enumerate(FIXED_LIST_STAGE_TYPE.params)
+                         if isinstance(param.distribution, FloatRangeDistribution)]
+_FIXED_LIST_LOW = np.array([param.distribution.low for param in FIXED_LIST_STAGE_TYPE.params], dtype=np.float64)
+_FIXED_LIST_HIGH = np.array([param.distribution.high for param in FIXED_LIST_STAGE_TYPE.params], dtype=np.float64)
+
+
+def create_fixed_list_matrix(size: int) -> np.ndarray:
+    """
+    Samples values of FIXED_LIST_STAGE_TYPE params for `size` individuals at once.
+    All values are drawn with one vectorized call per distribution kind.
+
+    :return: matrix of shape (size, len(FIXED_LIST_STAGE_TYPE.params)), one individual per row
+    """
+    values = np.empty((size, len(FIXED_LIST_STAGE_TYPE.params)), dtype=np.float64)
+    values[:, _FIXED_LIST_FLOAT_IDS] = _RNG.uniform(_FIXED_LIST_LOW[_FIXED_LIST_FLOAT_IDS],
+                                                    _FIXED_LIST_HIGH[_FIXED_LIST_FLOAT_IDS],
+                                                    size=(size, len(_FIXED_LIST_FLOAT_IDS)))
+    values[:, _FIXED_LIST_INT_IDS] = _RNG.integers(_FIXED_LIST_LOW[_FIXED_LIST_INT_IDS],
+                                                   _FIXED_LIST_HIGH[_FIXED_LIST_INT_IDS], endpoint=True,
+                                                   size=(size, len(_FIXED_LIST_INT_IDS)))
+    return values
+
+
+def create_fixed_list_values() -> List[float]:
+    """
+    Same as create_stage(FIXED_LIST_STAGE_TYPE).values, but sampled with create_fixed_list_matrix.
+    """
+    return create_fixed_list_matrix(1)[0].tolist()
+
 
 class PipelineParams(BaseModel, AbstractParams):
     pipeline: Pipeline
@@ -272,15 +312,32 @@ def create_individual(base_model: bool, use_pipeline: bool) -> AbstractParams:
                 pipeline = create_pipeline(STAGE_TYPES, lambda: random.randint(2, 4), REQUIRED_STAGE_TYPE)
                 params = PipelineParams(pipeline=pipeline)
         else:
-            stage = create_stage(FIXED_LIST_STAGE_TYPE)
-            values = stage.values
+            values = create_fixed_list_values()
             if base_model:
-                for i in [0, 4, 7, 10, 11, 15]:
+                for i in BASE_MODEL_ZERO_PARAMS:
                     values[i] = 0
             params = FixedListParams(params=values)
         if params.validate_params():
             return params
 
 
+def create_population(size: int, use_pipeline: bool) -> List[AbstractParams]:
+    """
+    Creates params for `size` individuals, the first one is the base model.
+    Fixed list params of the whole population are sampled with a single create_fixed_list_matrix call.
+    """
+    if use_pipeline:
+        return [create_individual(base_model=i == 0, use_pipeline=True) for i in range(size)]
+
+    values = create_fixed_list_matrix(size)
+    values[:1, BASE_MODEL_ZERO_PARAMS] = 0
+    population = []
+    for row in values.tolist():
+        params = FixedListParams(params=row)
+        params.validate_params()
+        population.append(params)
+    return population
+
+
 def iterations_of_type(stages, stage_type):
     return [stage for stage in stages if stage.stage_type.name == stage_type]
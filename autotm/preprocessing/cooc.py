@@ -27,7 +27,9 @@ class CoocDictionaries:
 def __create_batch_dictionary(batch):
     batch_dictionary = {}
     for index, token in enumerate(batch.token):
-        batch_dictionary[index] = token
+        # tokens are interned, so the global dictionaries share one string per token among all the batches
+        # and compare keys by identity
+        batch_dictionary[index] = sys.intern(token)
 
     return batch_dictionary
 
@@ -121,6 +123,7 @@ def calculate_cooc(batches_path: str, vocab: List[str], window_size: int=10) ->
     global_cooc_tf_dictionary = dict()
     global_cooc_df_term_dictionary = dict()
     global_cooc_tf_term_dictionary = dict()
+    vocab_set = set(vocab)
     for index, filename in enumerate(batches_list):
         local_time_start = time.time()
         logger.debug('Processing batch: %s' % index)
@@ -131,7 +134,7 @@ def calculate_cooc(batches_path: str, vocab: List[str], window_size: int=10) ->
             global_cooc_df_dictionary, global_cooc_tf_dictionary,
             global_cooc_df_term_dictionary, global_cooc_tf_term_dictionary,
             current_batch, window_size,
-            set(vocab)
+            vocab_set
         )
 
         logger.debug('Finished batch, elapsed time: %s' % (time.time() - local_time_start))
@@ -1,28 +1,38 @@
 import logging
+import multiprocessing as mp
 import os
-from typing import List, Union
+import shutil
+import tempfile
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional, Tuple, Union
 
 import artm
 import math
+import numpy as np
 import pickle
 import pandas as pd
-import re
 
 from autotm.preprocessing import PREPOCESSED_DATASET_FILENAME, RESERVED_TUPLE
 from autotm.preprocessing.cooc import calculate_cooc
-from autotm.utils import parallelize_dataframe
+from autotm.utils import merge_dicts
 import itertools
 from collections import Counter
 
 logger = logging.getLogger(__name__)
 
+# number of VW documents that are formatted, encoded and written at once
+VW_WRITE_BATCH_SIZE = 10000
+VW_WRITE_BUFFER_SIZE = 1 << 20
+# number of dataset rows that are read at once
+READ_CHUNK_SIZE = 100000
+
 # TODO: add inter-text coherence metrics (SemantiC, TopLen and FoCon)
 
 
 def get_words_dict(text, stop_list):
-    all_words = text
-    words = sorted(set(all_words) - stop_list)
-    return {w: all_words.count(w) for w in words}
+    # counting in a single pass instead of a list.count scan per unique word
+    words_counts = Counter(text)
+    return {w: words_counts[w] for w in sorted(words_counts.keys() - stop_list)}
 
 
 def vocab_preparation(VOCAB_PATH, DICTIONARY_PATH):
@@ -31,13 +41,8 @@ def vocab_preparation(VOCAB_PATH, DICTIONARY_PATH):
             with open(VOCAB_PATH, "w") as vocab_file:
                 dictionary_file.readline()
                 dictionary_file.readline()
-                for line in dictionary_file:
-                    elems = re.split(", ", line)
-                    vocab_file.write(" ".join(elems[:2]) + "\n")
-
-
-def _calculate_token_count():
-    raise NotImplementedError
+                # only the first two fields are needed, the rest of a line is left unsplit
+                vocab_file.writelines(" ".join(line.split(", ", 2)[:2]) + "\n" for line in dictionary_file)
 
 
 def _add_word_to_dict(word, w_dict):
@@ -48,50 +53,127 @@ def _add_word_to_dict(word, w_dict):
     return w_dict
 
 
-def _calculate_cooc_df_dict(data: list, vocab: List[str], window: int = 10) -> dict:
-    cooc_df_dict = {}  # format dict{(tuple): cooc}
-    term_freq_dict = {}
-    existing_vocab = set(vocab)
-    for text in data:
-        document_cooc_df_dict = {}
-        splitted = [word for word in text.split() if word in existing_vocab]
-        for i in range(0, len(splitted) - window):
-            for comb in itertools.combinations(splitted[i: i + window], 2):  # speed up
-                comb = tuple(sorted(comb))  # adding comb sorting
-                if comb in document_cooc_df_dict:
-                    continue
-                else:
-                    document_cooc_df_dict[comb] = 1
-                    term_freq_dict = _add_word_to_dict(comb[0], term_freq_dict)
-                    term_freq_dict = _add_word_to_dict(comb[1], term_freq_dict)
-        cooc_df_dict = dict(Counter(document_cooc_df_dict) + Counter(cooc_df_dict))
+def _encode_texts(data: list, vocab: List[str]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Encodes the vocabulary words of the texts as int32 ids
+
+    Ids follow the sorted order of words, so comparing ids is the same as comparing words.
+    Tokens of all the texts are stored in a flat array, text k occupies tokens[offsets[k]:offsets[k + 1]].
+    """
+    words = sorted(set(vocab))
+    word_ids = {word: i for i, word in enumerate(words)}
+    encoded = [[word_ids[word] for word in text.split() if word in word_ids] for text in data]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(text) for text in encoded], out=offsets[1:])
+    tokens = np.fromiter(itertools.chain.from_iterable(encoded), dtype=np.int32, count=offsets[-1])
+    return tokens, offsets, words
+
+
+def _window_pairs(tokens: np.ndarray, offsets: np.ndarray,
+                  window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds all the pairs of token positions that share at least one window
+
+    Windows of a text of length n start at 0, ..., n - window - 1, so a pair of positions p < q
+    is met in min(p, n - window - 1) - max(0, q - window + 1) + 1 of them.
+
+    :return: text indices, the first and the second tokens of the pairs and the number of windows they are met in
+    """
+    lengths = np.diff(offsets)
+    text_idx = np.repeat(np.arange(len(lengths)), lengths)
+    positions = np.arange(len(tokens)) - offsets[:-1][text_idx]
+    last_window_start = (lengths - window - 1)[text_idx]
+
+    pairs_text_idx, firsts, seconds, counts = [], [], [], []
+    for distance in range(1, window):
+        count = np.minimum(positions, last_window_start) - np.maximum(0, positions + distance - window + 1) + 1
+        met = np.flatnonzero(count > 0)
+        pairs_text_idx.append(text_idx[met])
+        firsts.append(tokens[met])
+        seconds.append(tokens[met + distance])
+        counts.append(count[met])
+
+    if not counts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, empty
+    return (np.concatenate(pairs_text_idx), np.concatenate(firsts).astype(np.int64),
+            np.concatenate(seconds).astype(np.int64), np.concatenate(counts))
+
+
+def _pairs_dict(words: List[str], pair_ids: np.ndarray, values: np.ndarray) -> dict:
+    unique_ids, inverse = np.unique(pair_ids, return_inverse=True)
+    sums = np.bincount(inverse, weights=values, minlength=len(unique_ids)).astype(np.int64)
+    vocab_size = len(words)
+    return {
+        (words[pair_id // vocab_size], words[pair_id % vocab_size]): value
+        for pair_id, value in zip(unique_ids.tolist(), sums.tolist())
+    }
+
+
+def _words_dict(words: List[str], *word_ids: np.ndarray, weights: Optional[np.ndarray] = None) -> dict:
+    freqs = sum(np.bincount(ids, weights=weights, minlength=len(words)) for ids in word_ids).astype(np.int64)
+    return {words[i]: freq for i, freq in enumerate(freqs.tolist()) if freq}
+
+
+def _cooc_df_dicts(words: List[str], text_idx: np.ndarray, firsts: np.ndarray, seconds: np.ndarray,
+                   _counts: np.ndarray) -> Tuple[dict, dict]:
+    # pairs are unordered and counted once per text
+    pair_ids = np.minimum(firsts, seconds) * len(words) + np.maximum(firsts, seconds)
+    order = np.lexsort((pair_ids, text_idx))
+    text_idx, pair_ids = text_idx[order], pair_ids[order]
+    is_new = np.ones(len(pair_ids), dtype=bool)
+    is_new[1:] = (text_idx[1:] != text_idx[:-1]) | (pair_ids[1:] != pair_ids[:-1])
+    pair_ids = pair_ids[is_new]
+
+    cooc_df_dict = _pairs_dict(words, pair_ids, np.ones(len(pair_ids)))  # format dict{(tuple): cooc}
+    term_freq_dict = _words_dict(words, pair_ids // len(words), pair_ids % len(words))
     return cooc_df_dict, term_freq_dict
 
 
-def _calculate_cooc_tf_dict(data: list, vocab: List[str], window: int = 10) -> dict:
-    term_freq_dict = {}
-    cooc_tf_dict = {RESERVED_TUPLE: 0}  # format dict{(tuple): cooc}
-    existing_vocab = set(vocab)
-    for text in data:
-        document_cooc_tf_dict = {}
-        splitted = [word for word in text.split() if word in existing_vocab]
-        for i in range(0, len(splitted) - window):
-            for comb in itertools.combinations(splitted[i: i + window], 2):
-                if comb in document_cooc_tf_dict:
-                    document_cooc_tf_dict[comb] += 1
-                else:
-                    document_cooc_tf_dict[comb] = 1
-
-                term_freq_dict = _add_word_to_dict(comb[0], term_freq_dict)
-                term_freq_dict = _add_word_to_dict(comb[1], term_freq_dict)
-                cooc_tf_dict[RESERVED_TUPLE] += 2
-        # cooc_tf_dict = dict(Counter(document_cooc_tf_dict) + Counter(cooc_tf_dict))
-        counter = Counter(document_cooc_tf_dict)
-        counter.update(cooc_tf_dict)
-        cooc_tf_dict = dict(counter)
+def _cooc_tf_dicts(words: List[str], _text_idx: np.ndarray, firsts: np.ndarray, seconds: np.ndarray,
+                   counts: np.ndarray) -> Tuple[dict, dict]:
+    # pairs are ordered as in the text and counted in every window they are met in
+    cooc_tf_dict = _pairs_dict(words, firsts * len(words) + seconds, counts)  # format dict{(tuple): cooc}
+    cooc_tf_dict[RESERVED_TUPLE] = 2 * int(counts.sum())
+    term_freq_dict = _words_dict(words, firsts, seconds, weights=counts)
     return cooc_tf_dict, term_freq_dict
-    # local_num_of_pairs += 2
-    # pass
+
+
+def _calculate_cooc_df_dict(data: list, vocab: List[str], window: int = 10) -> dict:
+    tokens, offsets, words = _encode_texts(data, vocab)
+    return _cooc_df_dicts(words, *_window_pairs(tokens, offsets, window))
+
+
+def _calculate_cooc_tf_dict(data: list, vocab: List[str], window: int = 10) -> dict:
+    tokens, offsets, words = _encode_texts(data, vocab)
+    return _cooc_tf_dicts(words, *_window_pairs(tokens, offsets, window))
+
+
+def _to_shared_memory(array: np.ndarray) -> shared_memory.SharedMemory:
+    # zero-sized shared memory can't be created
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm
+
+
+def _texts_window_pairs(tokens_shm: shared_memory.SharedMemory, offsets_shm: shared_memory.SharedMemory,
+                        texts_count: int, start: int, end: int, window: int):
+    offsets = np.ndarray((texts_count + 1,), dtype=np.int64, buffer=offsets_shm.buf)
+    tokens = np.ndarray((offsets[-1],), dtype=np.int32, buffer=tokens_shm.buf)
+    # the returned arrays are copies, so no view of the shared buffers outlives this call
+    return _window_pairs(tokens[offsets[start]: offsets[end]], offsets[start: end + 1] - offsets[start], window)
+
+
+def _calculate_cooc_dicts_part(args) -> Tuple[dict, dict, dict, dict]:
+    tokens_shm_name, offsets_shm_name, texts_count, words, start, end, window = args
+    tokens_shm = shared_memory.SharedMemory(name=tokens_shm_name)
+    offsets_shm = shared_memory.SharedMemory(name=offsets_shm_name)
+    try:
+        pairs = _texts_window_pairs(tokens_shm, offsets_shm, texts_count, start, end, window)
+    finally:
+        tokens_shm.close()
+        offsets_shm.close()
+    return (*_cooc_df_dicts(words, *pairs), *_cooc_tf_dicts(words, *pairs))
 
 
 def read_vocab(vocab_path: str) -> List[str]:
@@ -107,19 +189,41 @@ def read_vocab(vocab_path: str) -> List[str]:
     return vocab_words
 
 
+def _ppmi_values(word_1, pairs, n, term_freq_dict) -> List[str]:
+    word_1_freq = term_freq_dict[word_1]
+    ppmi_values = []
+    for word_2, value in pairs:
+        ppmi = max(math.log2((float(value) / n) / (term_freq_dict[word_2] / n * word_1_freq / n)), 0)
+        ppmi_values.append(f"{word_2}:{ppmi}")
+    return ppmi_values
+
+
 def calculate_ppmi(cooc_dict_path, n, term_freq_dict):
     print("Calculating pPMI...")
     ppmi_dict = {}
     with open(cooc_dict_path) as fopen:
         for line in fopen:
             splitted_line = line.split()
-            ppmi_dict[splitted_line[0]] = [
-                f'{word.split(":")[0].strip()}:{max(math.log2((float(word.split(":")[1]) / n) / (term_freq_dict[word.split(":")[0].strip()] / n * term_freq_dict[splitted_line[0]] / n)), 0)}'
-                for word in splitted_line[1:]
-            ]
+            word_1 = splitted_line[0]
+            # each "word:value" pair is split only once
+            pairs = (pair.split(":")[:2] for pair in splitted_line[1:])
+            ppmi_dict[word_1] = _ppmi_values(word_1, ((word_2.strip(), value) for word_2, value in pairs),
+                                             n, term_freq_dict)
     return ppmi_dict
 
 
+def calculate_ppmi_from_cooc_pairs(cooc_pairs, vocab_words, n, term_freq_dict):
+    """
+    Same as calculate_ppmi but takes the cooccurrences grouped by convert_to_vw_format_and_save
+    instead of parsing them back from the file that has just been written
+    """
+    print("Calculating pPMI...")
+    return {
+        word_1: _ppmi_values(word_1, cooc_pairs[word_1], n, term_freq_dict)
+        for word_1 in vocab_words if word_1 in cooc_pairs
+    }
+
+
 # TODO: rewrite to storing in rb tree
 def calculate_cooc_dicts(vocab: List[str], df: pd.DataFrame, window=10, n_cores=-1):
     """
@@ -131,42 +235,52 @@ def calculate_cooc_dicts(vocab: List[str], df: pd.DataFrame, window=10, n_cores=
     :return: cooc_df and cooc_tf dictionaries
     """
     data = df["processed_text"].tolist()
-    cooc_df_dict = parallelize_dataframe(
-        data,
-        _calculate_cooc_df_dict,
-        n_cores,
-        return_type="dict",
-        vocab=vocab,
-        window=window,
-    )
-    cooc_tf_dict = parallelize_dataframe(
-        data,
-        _calculate_cooc_tf_dict,
-        n_cores,
-        return_type="dict",
-        vocab=vocab,
-        window=window,
-    )
-    return cooc_df_dict, cooc_tf_dict
+    # texts are encoded once and shared with the workers, every worker takes its own range of texts
+    # and finds the window pairs once for both df and tf dictionaries
+    tokens, offsets, words = _encode_texts(data, vocab)
+    if n_cores == -1:
+        n_cores = mp.cpu_count() - 1
+    n_cores = max(1, min(n_cores, len(data)))
+    bounds = np.cumsum([0] + [len(part) for part in np.array_split(np.arange(len(data)), n_cores)])
+
+    tokens_shm = _to_shared_memory(tokens)
+    offsets_shm = _to_shared_memory(offsets)
+    try:
+        tasks = [
+            (tokens_shm.name, offsets_shm.name, len(data), words, start, end, window)
+            for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist())
+        ]
+        with mp.Pool(n_cores) as pool:
+            results = pool.map(_calculate_cooc_dicts_part, tasks, chunksize=1)
+    finally:
+        for shm in (tokens_shm, offsets_shm):
+            shm.close()
+            shm.unlink()
+
+    cooc_df, cooc_df_term, cooc_tf, cooc_tf_term = (merge_dicts(dicts) for dicts in zip(*results))
+    return (cooc_df, cooc_df_term), (cooc_tf, cooc_tf_term)
 
 
 def write_vw_dict(res_dict, vocab_words, fpath):
     with open(fpath, "w") as fopen:
-        for word in vocab_words:
-            try:
-                fopen.write(f"{word}" + " " + " ".join(res_dict[word]) + "\n")
-            except:
-                # print(f'The word {word} is not found')
-                pass
+        # words that are not found in the dictionary are skipped
+        fopen.writelines(
+            f"{word} {' '.join(res_dict[word])}\n" for word in vocab_words if word in res_dict
+        )
     print(f"{fpath} is ready!")
 
 
 def convert_to_vw_format_and_save(cooc_dict, vocab_words, vw_path):
+    """
+    Writes cooccurrences in VW format
+
+    :return: cooccurrences grouped by the first word as lists of (second word, value) pairs
+    """
     if isinstance(cooc_dict, tuple):
         t_cooc_dict = cooc_dict[0]
     else:
         t_cooc_dict = cooc_dict
-    data_dict = {}
+    cooc_pairs = {}
     for item in sorted(t_cooc_dict.items(), key=lambda key: key[0]):
         if item == RESERVED_TUPLE:
             continue
@@ -175,11 +289,15 @@ def convert_to_vw_format_and_save(cooc_dict, vocab_words, vw_path):
         # if vocab_words.index(item[0][0]) > vocab_words.index(item[0][1]):
         #     word_2 = item[0][0]
         #     word_1 = item[0][1]
-        if item[0][0] in data_dict:
-            data_dict[item[0][0]].append(f"{item[0][1]}:{item[1]}")
+        if item[0][0] in cooc_pairs:
+            cooc_pairs[item[0][0]].append((item[0][1], item[1]))
         else:
-            data_dict[item[0][0]] = [f"{item[0][1]}:{item[1]}"]
+            cooc_pairs[item[0][0]] = [(item[0][1], item[1])]
+    data_dict = {
+        word_1: [f"{word_2}:{value}" for word_2, value in pairs] for word_1, pairs in cooc_pairs.items()
+    }
     write_vw_dict(data_dict, vocab_words, vw_path)
+    return cooc_pairs
 
 
 def prepearing_cooc_dict(
@@ -214,8 +332,8 @@ def prepearing_cooc_dict(
 
     vocab_words = read_vocab(VOCAB_PATH)
 
-    data = pd.read_csv(path_to_dataset)
-    docs_count = data.shape[0]
+    # only the number of documents is needed, so a single column is parsed
+    docs_count = len(pd.read_csv(path_to_dataset, usecols=[0]))
 
     logger.debug("Performing calculate_cooc_dicts")
     cooc_dicts = calculate_cooc(batches_path=BATCHES_DIR, vocab=vocab_words, window_size=cooc_window)
@@ -227,12 +345,12 @@ def prepearing_cooc_dict(
 
     del cooc_tf_dict[RESERVED_TUPLE]
 
-    convert_to_vw_format_and_save(cooc_df_dict, vocab_words, cooc_file_path_df)
-    convert_to_vw_format_and_save(cooc_tf_dict, vocab_words, cooc_file_path_tf)
+    cooc_df_pairs = convert_to_vw_format_and_save(cooc_df_dict, vocab_words, cooc_file_path_df)
+    cooc_tf_pairs = convert_to_vw_format_and_save(cooc_tf_dict, vocab_words, cooc_file_path_tf)
 
     logger.debug("Performing calculate_ppmi")
-    ppmi_df = calculate_ppmi(cooc_file_path_df, docs_count, cooc_df_term_dict)
-    ppmi_tf = calculate_ppmi(cooc_file_path_tf, pairs_count, cooc_tf_term_dict)
+    ppmi_df = calculate_ppmi_from_cooc_pairs(cooc_df_pairs, vocab_words, docs_count, cooc_df_term_dict)
+    ppmi_tf = calculate_ppmi_from_cooc_pairs(cooc_tf_pairs, vocab_words, pairs_count, cooc_tf_term_dict)
     logger.debug("Performed calculate_ppmi")
 
     write_vw_dict(ppmi_tf, vocab_words, ppmi_dict_tf)
@@ -252,51 +370,105 @@ def prepearing_cooc_dict(
 
 
 def return_string_part(name_type, text):
+    # split() without arguments never yields empty tokens,
+    # so every token gets its ":1" weight from a single join instead of a per-token format
     tokens = text.split()
-    tokens = [item for item in tokens if item != ""]
+    if not tokens:
+        return f" |{name_type} "
+    return f" |{name_type} " + ":1 ".join(tokens) + ":1"
+
+
+def _write_vw_documents(ofile, texts: List[str]):
+    for i in range(0, len(texts), VW_WRITE_BATCH_SIZE):
+        batch = "".join(
+            f"{return_string_part('@default_class', text)}\n" for text in texts[i: i + VW_WRITE_BATCH_SIZE]
+        )
+        ofile.write(batch.encode("utf8"))
+
+
+def _iter_csv_texts(path: str, column_name: str) -> Iterator[List[str]]:
+    # the file is parsed by chunks, so memory doesn't grow with its size
+    with pd.read_csv(path, usecols=[column_name], chunksize=READ_CHUNK_SIZE) as chunks:
+        for chunk in chunks:
+            yield chunk[column_name].tolist()
+
+
+def _iter_part_texts(part_path: str, column_name: str) -> Iterator[List[str]]:
+    if part_path.endswith(".csv"):
+        yield from _iter_csv_texts(part_path, column_name)
+        return
+
+    # parquet parts are streamed by record batches of the single needed column
+    # instead of being materialized as a whole dataframe
+    import pyarrow.parquet as pq
+
+    part = pq.ParquetFile(part_path)
+    for batch in part.iter_batches(batch_size=READ_CHUNK_SIZE, columns=[column_name]):
+        yield batch.column(0).to_pylist()
+
+
+def _write_vw_part(ofile, part_path: str, column_name: str):
+    for texts in _iter_part_texts(part_path, column_name):
+        _write_vw_documents(ofile, texts)
+
+
+def _prepare_voc_part(args: Tuple[str, str, str]) -> str:
+    part_path, shard_path, column_name = args
+    with open(shard_path, "wb", buffering=VW_WRITE_BUFFER_SIZE) as shard:
+        _write_vw_part(shard, part_path, column_name)
+    return shard_path
+
+
+def _prepare_voc_parts(ofile, part_paths: List[str], column_name: str, n_cores: int):
+    if n_cores == -1:
+        n_cores = mp.cpu_count() - 1
+    n_cores = max(1, min(n_cores, len(part_paths)))
+    if n_cores == 1:
+        for num_part, part_path in enumerate(part_paths):
+            print("part_{}".format(num_part), end="\r")
+            _write_vw_part(ofile, part_path, column_name)
+        return
 
-    return " |" + name_type + " " + " ".join(["{}:1".format(token) for token in tokens])
+    # every part is written to its own shard, shards are concatenated in the order of parts
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(ofile.name))) as shards_dir:
+        tasks = [
+            (part_path, os.path.join(shards_dir, f"shard_{num_part}.txt"), column_name)
+            for num_part, part_path in enumerate(part_paths)
+        ]
+        with mp.Pool(n_cores) as pool:
+            shard_paths = pool.map(_prepare_voc_part, tasks, chunksize=1)
+        for shard_path in shard_paths:
+            with open(shard_path, "rb") as shard:
+                shutil.copyfileobj(shard, ofile, VW_WRITE_BUFFER_SIZE)
 
 
-def prepare_voc(batches_dir, vw_path, dataset: Union[pd.DataFrame, str], column_name="processed_text.txt"):
+def prepare_voc(batches_dir, vw_path, dataset: Union[pd.DataFrame, str], column_name="processed_text.txt",
+                n_cores=-1):
     print("Starting...")
-    with open(vw_path, "w", encoding="utf8") as ofile:
+    with open(vw_path, "wb", buffering=VW_WRITE_BUFFER_SIZE) as ofile:
         if isinstance(dataset, str):
-            num_parts = 0
             try:
-                for file in os.listdir(dataset):
-                    if file.startswith("part"):
-                        print("part_{}".format(num_parts), end="\r")
-                        if file.split(".")[-1] == "csv":
-                            part = pd.read_csv(os.path.join(dataset, file))
-                        else:
-                            part = pd.read_parquet(os.path.join(dataset, file))
-                        part_processed = part[column_name].tolist()
-                        for text in part_processed:
-                            result = return_string_part("@default_class", text)
-                            ofile.write(result + "\n")
-                        num_parts += 1
+                with os.scandir(dataset) as entries:
+                    part_paths = sorted(
+                        entry.path for entry in entries if entry.name.startswith("part") and entry.is_file()
+                    )
+                _prepare_voc_parts(ofile, part_paths, column_name, n_cores)
 
             except NotADirectoryError:
                 print("part 1/1")
-                part = pd.read_csv(dataset)
-                part_processed = part[column_name].tolist()
-                for text in part_processed:
-                    result = return_string_part("@default_class", text)
-                    ofile.write(result + "\n")
+                for texts in _iter_csv_texts(dataset, column_name):
+                    _write_vw_documents(ofile, texts)
         else:
-            part_processed = dataset[column_name].tolist()
-            for text in part_processed:
-                result = return_string_part("@default_class", text)
-                ofile.write(result + "\n")
+            _write_vw_documents(ofile, dataset[column_name].tolist())
 
     logger.info(" batches {} \n vocabulary {} \n are ready".format(batches_dir, vw_path))
 
 
 def prepare_batch_vectorizer(
-    batches_dir: str, vw_path: str, dataset: Union[pd.DataFrame, str], column_name: str = "processed_text"
+    batches_dir: str, vw_path: str, dataset: Union[pd.DataFrame, str], column_name: str = "processed_text",
+    n_cores: int = -1
 ):
-    prepare_voc(batches_dir, vw_path, dataset, column_name=column_name)
+    prepare_voc(batches_dir, vw_path, dataset, column_name=column_name, n_cores=n_cores)
     batch_vectorizer = artm.BatchVectorizer(
         data_path=vw_path,
         data_format="vowpal_wabbit",
@@ -26,9 +26,9 @@ nltk.download("wordnet")
 stop = stopwords.words("russian") + [" "] + stopwords.words("english")
 
 r_html = re.compile(r"(\<[^>]*\>)")
-r_punct = re.compile(r'[."\[\]/,()!?;:*#|\\%^$&{}~_`=-@]')
+# punctuation and digits are replaced in one pass, whole runs at once; spaces are squeezed afterwards anyway
+r_punct_num = re.compile(r'[."\[\]/,()!?;:*#|\\%^$&{}~_`=-@0-9]+')
 r_vk_ids = re.compile(r"(id{1}[0-9]*)")
-r_num = re.compile(r"([0-9]+)")
 r_white_space = re.compile(r"\s{2,}")
 r_words = re.compile(r"\W+")
 r_pat = re.compile(r"[aA-zZ]")
@@ -58,9 +58,8 @@ def remove_html(text: str) -> str:
 
 
 def process_punkt(text: str) -> str:
-    text = r_punct.sub(" ", text)
+    text = r_punct_num.sub(" ", text)
     text = r_vk_ids.sub(" ", text)
-    text = r_num.sub(" ", text)
     text = r_white_space.sub(" ", text)
     return text.strip()
 
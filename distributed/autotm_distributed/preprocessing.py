@@ -5,6 +5,7 @@ import os
 import pickle
 import re
 import subprocess
+from collections import Counter
 from typing import Union
 
 import artm
@@ -129,18 +130,17 @@ def tokens_num(text):
 
 
 def get_words_dict(text, stop_list):
-    all_words = text
-    words = sorted(set(all_words) - stop_list)
-
-    return {w: all_words.count(w) for w in words}
+    # counting in a single pass instead of a list.count scan per unique word
+    words_counts = Counter(text)
+    return {w: words_counts[w] for w in sorted(words_counts.keys() - stop_list)}
 
 
 def return_string_part(name_type, text):
-    tokens = text.split()
-    tokens = [item for item in tokens if item != '']
-    tokens_dict = get_words_dict(tokens, set())
+    # split() without arguments never yields empty tokens;
+    # there is no stop list here and VW doesn't need sorted tokens, so the counts are used as is
+    tokens_counts = Counter(text.split())
 
-    return " |" + name_type + ' ' + ' '.join(['{}:{}'.format(k, v) for k, v in tokens_dict.items()])
+    return f" |{name_type} " + ' '.join(f'{k}:{v}' for k, v in tokens_counts.items())
 
 
 def prepare_voc(batches_dir, vw_path, data_path, column_name='processed_text'):
@@ -151,23 +151,19 @@ def prepare_voc(batches_dir, vw_path, data_path, column_name='processed_text'):
             for file in os.listdir(data_path):
                 if file.startswith('part'):
                     print('part_{}'.format(num_parts), end='\r')
-                    if file.split('.')[-1] == 'csv':
-                        part = pd.read_csv(os.path.join(data_path, file))
+                    if file.endswith('.csv'):
+                        part = pd.read_csv(os.path.join(data_path, file), usecols=[column_name])
                     else:
-                        part = pd.read_parquet(os.path.join(data_path, file))
+                        part = pd.read_parquet(os.path.join(data_path, file), columns=[column_name])
                     part_processed = part[column_name].tolist()
-                    for text in part_processed:
-                        result = return_string_part('@default_class', text)
-                        ofile.write(result + '\n')
+                    ofile.writelines(f"{return_string_part('@default_class', text)}\n" for text in part_processed)
                     num_parts += 1
 
         except NotADirectoryError:
             print('part 1/1')
-            part = pd.read_csv(data_path)
+            part = pd.read_csv(data_path, usecols=[column_name])
             part_processed = part[column_name].tolist()
-            for text in part_processed:
-                result = return_string_part('@default_class', text)
-                ofile.write(result + '\n')
+            ofile.writelines(f"{return_string_part('@default_class', text)}\n" for text in part_processed)
 
     print(' batches {} \n vocabulary {} \n are ready'.format(batches_dir, vw_path))
 
@@ -205,9 +201,11 @@ def preparing_cooc_dict(BATCHES_DIR, WV_PATH, VOCAB_PATH, COOC_DICTIONARY_PATH,
 
     ]
 
-    cproc = subprocess.run(cmd_args, capture_output=True)
+    # only stderr is kept to report a failure, the progress output isn't buffered
+    cproc = subprocess.run(cmd_args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
 
-    assert cproc.returncode == 0
+    if cproc.returncode != 0:
+        raise RuntimeError(f"bigartm failed with exit code {cproc.returncode}: {cproc.stderr}")
     cooc_dict = artm.Dictionary()
     cooc_dict.gather(
         data_path=BATCHES_DIR,
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from autotm.algorithms_for_tuning.genetic_algorithm import kernels
+from autotm.algorithms_for_tuning.genetic_algorithm.crossover import (crossover_one_point_batch,
+                                                                      crossover_blend_batch)
+
+
+@pytest.fixture
+def parents():
+    rng = np.random.default_rng(0)
+    return rng.random((5, 16)), rng.random((5, 16))
+
+
+@pytest.mark.parametrize("elem_cross_prob", [0.0, 1.0])
+def test_one_point_batch_extreme_probabilities(parents, elem_cross_prob):
+    """Test children are either copies or swaps of the parents"""
+    parents_1, parents_2 = parents
+    child_1, child_2 = crossover_one_point_batch(parents_1, parents_2, elem_cross_prob=elem_cross_prob)
+    if elem_cross_prob == 0.0:
+        np.testing.assert_array_equal(child_1, parents_1)
+        np.testing.assert_array_equal(child_2, parents_2)
+    else:
+        np.testing.assert_array_equal(child_1, parents_2)
+        np.testing.assert_array_equal(child_2, parents_1)
+
+
+def test_one_point_batch_keeps_genes(parents):
+    """Test every gene of a child comes from one of the parents at the same position"""
+    parents_1, parents_2 = parents
+    child_1, child_2 = crossover_one_point_batch(parents_1, parents_2, elem_cross_prob=0.5)
+    assert np.all((child_1 == parents_1) | (child_1 == parents_2))
+    np.testing.assert_array_equal(child_1 + child_2, parents_1 + parents_2)
+
+
+def test_blend_batch(parents):
+    """Test blend children lie on the lines through the parents and inherit meta params"""
+    parents_1, parents_2 = parents
+    [child] = crossover_blend_batch(parents_1, parents_2, alpha=0.5)
+    assert child.shape == parents_1.shape
+
+    # child = parent_1 + gamma * (parent_2 - parent_1) with one gamma per pair
+    gamma = (child[:, 0] - parents_1[:, 0]) / (parents_2[:, 0] - parents_1[:, 0])
+    expected = parents_1 + gamma[:, np.newaxis] * (parents_2 - parents_1)
+    np.testing.assert_allclose(child[:, :12], expected[:, :12])
+    np.testing.assert_allclose(child[:, 15], expected[:, 15])
+
+    meta = child[:, 12:15]
+    assert np.all(np.all(meta == parents_1[:, 12:15], axis=1) | np.all(meta == parents_2[:, 12:15], axis=1))
+
+
+def test_kernels_match_numpy_fallback(parents):
+    """Test compiled kernels give the same results as the NumPy fallback"""
+    parents_1, parents_2 = parents
+    rng = np.random.default_rng(1)
+    gamma = rng.random(len(parents_1))
+    from_parent_1 = rng.random(len(parents_1)) > 0.5
+    rand_mat = rng.random(parents_1.shape)
+
+    np.testing.assert_allclose(
+        kernels.blend_crossover_kernel(parents_1, parents_2, gamma, from_parent_1, np.empty_like(parents_1)),
+        kernels._blend_crossover_numpy(parents_1, parents_2, gamma, from_parent_1, np.empty_like(parents_1)),
+    )
+    for actual, expected in zip(
+            kernels.uniform_crossover_kernel(parents_1, parents_2, rand_mat, 0.5,
+                                             np.empty_like(parents_1), np.empty_like(parents_2)),
+            kernels._uniform_crossover_numpy(parents_1, parents_2, rand_mat, 0.5,
+                                             np.empty_like(parents_1), np.empty_like(parents_2))):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_batch_crossovers_write_to_out(parents):
+    """Test children are written to the provided buffers"""
+    parents_1, parents_2 = parents
+    out = [np.empty_like(parents_1), np.empty_like(parents_2)]
+    children = crossover_one_point_batch(parents_1, parents_2, elem_cross_prob=0.5, out=out)
+    assert all(child is buffer for child, buffer in zip(children, out))
+
+    [child] = crossover_blend_batch(parents_1, parents_2, alpha=0.5, out=out[:1])
+    assert child is out[0]
@@ -1,8 +1,9 @@
 import pandas as pd
 import pytest
 
+from autotm.preprocessing import RESERVED_TUPLE
 from autotm.preprocessing.dictionaries_preparation import (
-    _add_word_to_dict)
+    _add_word_to_dict, _calculate_cooc_df_dict, _calculate_cooc_tf_dict, get_words_dict, return_string_part)
 
 DATASET_PROCESSED_TINY = pd.DataFrame(
     {
@@ -25,3 +26,25 @@ def tiny_dataset_(tmpdir):
 def test__add_word_to_dict():
     test_dict = {}
     assert _add_word_to_dict('test', test_dict) == {'test': 1}
+
+
+def test_get_words_dict():
+    tokens = "test the testing test to test the test".split()
+    assert list(get_words_dict(tokens, {"to"}).items()) == [('test', 4), ('testing', 1), ('the', 2)]
+
+
+def test_return_string_part():
+    assert return_string_part("@default_class", "a  b\tc\n a") == " |@default_class a:1 b:1 c:1 a:1"
+    assert return_string_part("@default_class", " \t\n") == " |@default_class "
+
+
+def test__calculate_cooc_dicts():
+    data = ["b a c b a", "a x b b"]
+    vocab = ["a", "b", "c"]
+    cooc_df_dict, df_term_dict = _calculate_cooc_df_dict(data, vocab, window=3)
+    assert cooc_df_dict == {("a", "b"): 1, ("a", "c"): 1, ("b", "c"): 1}
+    assert df_term_dict == {"a": 2, "b": 2, "c": 2}
+    cooc_tf_dict, tf_term_dict = _calculate_cooc_tf_dict(data, vocab, window=3)
+    assert cooc_tf_dict == {("b", "a"): 1, ("b", "c"): 1, ("a", "c"): 2, ("a", "b"): 1, ("c", "b"): 1,
+                            RESERVED_TUPLE: 12}
+    assert tf_term_dict == {"a": 4, "b": 4, "c": 4}
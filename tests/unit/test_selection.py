@@ -0,0 +1,20 @@
+import numpy as np
+
+from autotm.algorithms_for_tuning.genetic_algorithm.selection import select_matching_pairs
+
+
+def test_select_matching_pairs():
+    """Test the chosen pairs are valid and the requested number of them is distinct"""
+    probabilities = np.linspace(0.1, 1.0, 10)
+    parents_1, parents_2 = select_matching_pairs(6, probabilities)
+
+    assert len(parents_1) == len(parents_2) >= 6
+    assert np.all(parents_1 != parents_2)
+    assert np.all((0 <= parents_1) & (parents_1 < 10)) and np.all((0 <= parents_2) & (parents_2 < 10))
+    assert len({frozenset(pair) for pair in zip(parents_1.tolist(), parents_2.tolist())}) >= 6
+
+
+def test_select_matching_pairs_no_selected():
+    """Test no pairs are chosen when no individual can be selected"""
+    parents_1, parents_2 = select_matching_pairs(3, np.full(5, -1.0))
+    assert len(parents_1) == len(parents_2) == 0